@@ -0,0 +1,67 @@
+"""
+OSDAG Screening Task - Shared Data Loader
+-----------------------------------------
+File: data_loader.py
+Author: Divit Singhania
+Description:
+    Opens the screening task NetCDF exactly once per process and hands out
+    the eagerly loaded 'forces' DataArray. Every script previously opened
+    (and lazily decoded) the dataset on its own; caching the handle here
+    means the metadata/coordinate decoding cost is paid a single time.
+"""
+
+import os
+from functools import lru_cache
+
+import numpy as np
+import xarray as xr
+
+DATA_PATH = os.path.join("..", "data", "screening_task.nc")
+
+
+@lru_cache(maxsize=1)
+def get_forces():
+    """
+    Returns the 'forces' DataArray, fully loaded into memory.
+
+    The lru_cache makes repeat calls free, so downstream modules can call
+    this wherever convenient instead of passing the array around.
+    """
+    ds = xr.open_dataset(DATA_PATH)
+    return ds.forces.load()
+
+
+@lru_cache(maxsize=1)
+def get_force_table():
+    """
+    Returns (array, element_index, component_index) for positional reads.
+
+    The array is the forces data as a contiguous (Element, Component)
+    ndarray; the two dicts map labels to row/column numbers. Reads through
+    these are plain O(1) NumPy indexing with no Xarray label-translation
+    machinery on the call path.
+    """
+    da = get_forces().transpose("Element", "Component")
+    arr = np.ascontiguousarray(da.values)
+    eidx = {int(e): i for i, e in enumerate(da.Element.values)}
+    cidx = {str(c): i for i, c in enumerate(da.Component.values)}
+    return arr, eidx, cidx
+
+
+def force(eid, comp):
+    """Scalar force value for one element/component, by positional lookup."""
+    arr, eidx, cidx = get_force_table()
+    return arr[eidx[eid], cidx[comp]]
+
+
+def force_block(eids, comps):
+    """
+    Block of force values for lists of elements and components.
+
+    Returns a (len(eids), len(comps)) ndarray, the positional equivalent
+    of forces.sel(Element=eids, Component=comps).values.
+    """
+    arr, eidx, cidx = get_force_table()
+    rows = [eidx[e] for e in eids]
+    cols = [cidx[c] for c in comps]
+    return arr[np.ix_(rows, cols)]
@@ -13,27 +13,49 @@ Description:
     - Includes darker internal hatching and zero-crossing labels.
 """
 
-import xarray as xr
 import plotly.graph_objects as go
 import numpy as np
-import os
 
 # Import structural topology (Node coordinates and Element connectivity)
 from data.element import members
 from data.node import nodes
+from data_loader import force_block, get_forces
+from fig_cache import cached_figure
 
 # CONFIGURATION
-DATA_PATH = os.path.join("..", "data", "screening_task.nc")
 CENTRAL_GIRDER_IDS = [15, 24, 33, 42, 51, 60, 69, 78, 83]
 
-# Load Dataset
+# Structure-of-Arrays view of the topology: one contiguous coordinate array
+# per field, with IDX_OF mapping element ID -> row. The hot loops then use
+# plain integer indexing instead of chained dict lookups.
+ELEM_IDS = sorted(members.keys())
+START_X = np.array([nodes[members[e][0]][0] for e in ELEM_IDS])
+END_X = np.array([nodes[members[e][1]][0] for e in ELEM_IDS])
+IDX_OF = {e: i for i, e in enumerate(ELEM_IDS)}
+
+# Load Dataset (shared, in-memory - see data_loader.py)
 try:
-    ds = xr.open_dataset(DATA_PATH)
+    get_forces()
 except FileNotFoundError:
-    print("Error: Dataset not found. Please check the DATA_PATH.")
+    print("Error: Dataset not found. Please check data_loader.DATA_PATH.")
     exit()
 
 
+def _segments(a, b, gap=np.nan):
+    """
+    Interleave two equal-length arrays into a flat [a0, b0, gap, a1, b1, gap, ...] array.
+
+    Plotly treats NaN as a line break, so each (a[k], b[k]) pair becomes its
+    own segment inside a single trace. Runs in NumPy instead of a Python loop.
+    """
+    out = np.empty(3 * len(a))
+    out[0::3] = a
+    out[1::3] = b
+    out[2::3] = gap
+    return out
+
+
+@cached_figure
 def generate_midas_style_plot(comp_i, comp_j, title, color, unit, is_step=False):
     """
     Generates a Plotly Figure for structural forces.
@@ -47,66 +69,79 @@ def generate_midas_style_plot(comp_i, comp_j, title, color, unit, is_step=False)
     """
     fig = go.Figure()
 
-    # Lists to store the continuous boundary path
-    x_full_path = []
-    y_full_path = []
-
-    # Iterate through elements to build the diagram piece-by-piece
-    for eid in CENTRAL_GIRDER_IDS:
-        # 1. Get Node Coordinates
-        start_node, end_node = members[eid]
-        x_i = nodes[start_node][0]  # X-coordinate of start node
-        x_j = nodes[end_node][0]  # X-coordinate of end node
-
-        # 2. Get Force Values directly from Xarray
-        # No manual sign flipping is performed, adhering to the dataset's convention.
-        val_i = float(ds.forces.sel(Element=eid, Component=comp_i))
-        val_j = float(ds.forces.sel(Element=eid, Component=comp_j))
-
-        # 3. Define Segment Geometry
-        if is_step:
-            # SFD: Shear is constant along the element.
-            # We visualize this as a flat "step".
-            x_segment = [x_i, x_j]
-            y_segment = [val_i, val_i]
-            val_start, val_end = val_i, val_i
-        else:
-            # BMD: Moment varies linearly from node i to node j.
-            x_segment = [x_i, x_j]
-            y_segment = [val_i, val_j]
-            val_start, val_end = val_i, val_j
-
-        # Append to full path for the main boundary line
-        x_full_path.extend(x_segment)
-        y_full_path.extend(y_segment)
-
-        # 4. Generate Internal Hatching (The "Rough" Look)
-        # We generate vertical lines to create a "filled" structural diagram effect.
-        hatch_density = 12
-        hatch_x = np.linspace(x_i, x_j, hatch_density)
-
-        for hx in hatch_x:
-            # Interpolate Y value at this hatch position
-            hy = val_start if is_step else val_start + (val_end - val_start) * (hx - x_i) / (x_j - x_i)
-
-            # Add vertical line from y=0 to y=hy
-            fig.add_shape(type="line", x0=hx, y0=0, x1=hx, y1=hy,
-                          line=dict(color="rgba(30, 30, 30, 0.8)", width=1.3))
-
-        # 5. Label Zero Crossings
-        # Calculate exact intersection where force changes sign
-        if not is_step and (val_i * val_j < 0):
-            x_zero = x_i - val_i * (x_j - x_i) / (val_j - val_i)
-            fig.add_annotation(
+    # Bulk-fetch all force values in one positional block read - no Xarray
+    # label indexing anywhere on the hot path (see data_loader.py).
+    # No manual sign flipping is performed, adhering to the dataset's convention.
+    arr = force_block(CENTRAL_GIRDER_IDS, [comp_i, comp_j])
+
+    # Pre-fetch node X-coordinates for every element (start, end) pair
+    rows = [IDX_OF[eid] for eid in CENTRAL_GIRDER_IDS]
+    xs = np.column_stack((START_X[rows], END_X[rows]))
+
+    # Continuous boundary path: (start, end) node pairs flattened in order.
+    # The final lengths are known up front, so everything is built as full
+    # arrays instead of lists grown element-by-element.
+    x_full_path = xs.ravel()
+    if is_step:
+        # SFD: Shear is constant along the element.
+        # We visualize this as a flat "step".
+        y_full_path = np.repeat(arr[:, 0], 2)
+    else:
+        # BMD: Moment varies linearly from node i to node j.
+        y_full_path = arr.ravel()
+
+    # Internal Hatching (The "Rough" Look)
+    # Vertical lines create a "filled" structural diagram effect. Positions
+    # and interpolated heights for EVERY element are computed in one
+    # broadcasting step: rows are elements, columns are hatch positions.
+    hatch_density = 12
+    frac = np.linspace(0, 1, hatch_density)[None, :]
+    hx = (xs[:, :1] + (xs[:, 1:] - xs[:, :1]) * frac).ravel()
+    if is_step:
+        hy = np.repeat(arr[:, :1], hatch_density, axis=1).ravel()
+    else:
+        hy = (arr[:, :1] + (arr[:, 1:] - arr[:, :1]) * frac).ravel()
+
+    # Vertical lines from y=0 to y=hy, all in one trace
+    hx_all = _segments(hx, hx)
+    hy_all = _segments(np.zeros(hx.size), hy)
+
+    # Annotations are collected locally and assigned to the layout in one
+    # go at the end; every fig.add_annotation() call re-validates the
+    # whole layout, so batching sidesteps that overhead.
+    annos = []
+
+    # Label Zero Crossings
+    # Sign changes and exact intersections are computed for the whole girder
+    # in one vectorized pass (BMD only - the stepped SFD never crosses
+    # within an element).
+    if not is_step:
+        mask = arr[:, 0] * arr[:, 1] < 0
+        x_zeros = (xs[mask, 0]
+                   - arr[mask, 0] * (xs[mask, 1] - xs[mask, 0]) / (arr[mask, 1] - arr[mask, 0]))
+        for x_zero in x_zeros:
+            annos.append(dict(
                 x=x_zero, y=0, text=f"<b>x={x_zero:.2f} m</b>",
                 showarrow=True, arrowhead=2, font=dict(color="green", size=10),
                 bgcolor="white", bordercolor="green", yshift=20
-            )
+            ))
 
     # PLOTTING TRACES
 
-    # Trace 1: The Main Boundary Line (with markers at nodes)
-    fig.add_trace(go.Scatter(
+    # WebGL traces: Scattergl renders these dense line sets on the GPU,
+    # which is markedly faster than the SVG Scatter for this many vertices.
+
+    # Trace 1: Internal Hatching (all vertical lines in a single trace)
+    fig.add_trace(go.Scattergl(
+        x=hx_all, y=hy_all,
+        mode='lines',
+        line=dict(color="rgba(30, 30, 30, 0.8)", width=1.3),
+        hoverinfo='skip',
+        showlegend=False
+    ))
+
+    # Trace 2: The Main Boundary Line (with markers at nodes)
+    fig.add_trace(go.Scattergl(
         x=x_full_path, y=y_full_path,
         mode='lines+markers',
         marker=dict(size=4, color=color),
@@ -115,19 +150,19 @@ def generate_midas_style_plot(comp_i, comp_j, title, color, unit, is_step=False)
     ))
 
     # Annotate Global Max/Min
-    y_arr = np.array(y_full_path)
-    max_idx, min_idx = np.argmax(y_arr), np.argmin(y_arr)
+    max_idx, min_idx = np.argmax(y_full_path), np.argmin(y_full_path)
 
     for idx, label in [(max_idx, "MAX"), (min_idx, "MIN")]:
-        fig.add_annotation(
+        annos.append(dict(
             x=x_full_path[idx], y=y_full_path[idx],
             text=f"<b>{label}: {y_full_path[idx]:.3f} {unit}</b>",
             showarrow=True, arrowhead=2, bgcolor="white", bordercolor="black",
             font=dict(color=color, size=12)
-        )
+        ))
 
-    # Layout Styling
+    # Layout Styling (annotations attached in one validated assignment)
     fig.update_layout(
+        annotations=annos,
         title=f"<b>{title} (Continuous Rough Analysis)</b>",
         xaxis_title="Bridge Longitudinal Axis (X) [m]",
         yaxis_title=f"Magnitude [{unit}]",
@@ -14,16 +14,15 @@ Description:
     4. Aspect Ratio Correction: X and Y axes are manually scaled to make forces visible.
 """
 
-import xarray as xr
 import plotly.graph_objects as go
+import numpy as np
+from numba import njit
 from data.node import nodes
 from data.element import members
-import os
+from data_loader import force_block
+from fig_cache import cached_figure
 
 # 1. SETUP & DATA DEFINITION
-DATA_PATH = os.path.join("..", "data", "screening_task.nc")
-ds = xr.open_dataset(DATA_PATH)
-
 # Dictionary defining the structural topology for all 5 girders
 GIRDERS = {
     "Girder 1": {"elements": [13, 22, 31, 40, 49, 58, 67, 76, 81], "nodes": [1, 11, 16, 21, 26, 31, 36, 41, 46, 6]},
@@ -33,6 +32,90 @@ GIRDERS = {
     "Girder 5": {"elements": [17, 26, 35, 44, 53, 62, 71, 80, 85], "nodes": [5, 15, 20, 25, 30, 35, 40, 45, 50, 10]}
 }
 
+# Flat list of every girder element, used for bulk force selection
+ALL_GIRDER_EIDS = [eid for g_data in GIRDERS.values() for eid in g_data["elements"]]
+
+# Structure-of-Arrays view of the topology: contiguous start/end coordinate
+# arrays with IDX_OF mapping element ID -> row, so the plotting loop reads
+# cache-friendly arrays instead of doing three dict lookups per element.
+ELEM_IDS = sorted(members.keys())
+START_X = np.array([nodes[members[e][0]][0] for e in ELEM_IDS])
+END_X = np.array([nodes[members[e][1]][0] for e in ELEM_IDS])
+START_Z = np.array([nodes[members[e][0]][2] for e in ELEM_IDS])
+END_Z = np.array([nodes[members[e][1]][2] for e in ELEM_IDS])
+IDX_OF = {e: i for i, e in enumerate(ELEM_IDS)}
+
+
+def _profile_sfd(vals, height_scale):
+    """
+    Stepped (SFD) profile: constant height and colour along each element,
+    both taken from the start-node shear.
+    """
+    h = vals[:, 0] * height_scale
+    return h, h, vals[:, 0], vals[:, 0]
+
+
+def _profile_bmd(vals, height_scale):
+    """
+    Linear (BMD) profile: height slopes from node i to node j, with a
+    matching colour gradient.
+    """
+    return (vals[:, 0] * height_scale, vals[:, 1] * height_scale,
+            vals[:, 0], vals[:, 1])
+
+
+def _interleave(a, b, gap=np.nan):
+    """
+    Pack two per-element arrays into one flat [a0, b0, gap, ...] buffer.
+
+    The output length is known up front, so the array is preallocated and
+    filled with strided assignment - no per-element list growth. A NaN gap
+    breaks the line in Plotly just like None.
+    """
+    out = np.empty(3 * len(a))
+    out[0::3] = a
+    out[1::3] = b
+    out[2::3] = gap
+    return out
+
+
+@njit(cache=True)
+def build_fence(x1, x2, z1, z2, h1, h2, c1, c2, num_lines):
+    """
+    Build the vertical "fence" hatching for a whole girder at once.
+
+    Takes per-element start/end coordinates, scaled heights and colour
+    values, and returns flat (hx, hy, hz, hc) arrays with NaN separators
+    (Plotly breaks the line at NaN, same as None). Compiled by Numba, so
+    the nested interpolation loops run as machine code instead of
+    interpreted Python.
+    """
+    n = x1.size
+    total = n * (num_lines + 1) * 3
+    hx = np.empty(total)
+    hy = np.empty(total)
+    hz = np.empty(total)
+    hc = np.empty(total)
+
+    p = 0
+    for e in range(n):
+        for k in range(num_lines + 1):
+            frac = k / num_lines
+            cx = x1[e] + (x2[e] - x1[e]) * frac
+            cz = z1[e] + (z2[e] - z1[e]) * frac
+            ch = h1[e] + (h2[e] - h1[e]) * frac
+            cc = c1[e] + (c2[e] - c1[e]) * frac
+
+            # Vertical line from 0 to ch, then a NaN break
+            hx[p], hx[p + 1], hx[p + 2] = cx, cx, np.nan
+            hy[p], hy[p + 1], hy[p + 2] = 0.0, ch, np.nan
+            hz[p], hz[p + 1], hz[p + 2] = cz, cz, np.nan
+            hc[p], hc[p + 1], hc[p + 2] = cc, cc, cc
+            p += 3
+
+    return hx, hy, hz, hc
+
+@cached_figure
 def create_midas_polished_plot(comp_i, comp_j, title):
     """
     Generates a 3D structural analysis plot.
@@ -42,28 +125,30 @@ def create_midas_polished_plot(comp_i, comp_j, title):
         title: Plot title
     """
     fig = go.Figure()
-    diagram_type = "SFD" if "Vy" in comp_i else "BMD"
+
+    # Hoisted invariants: the SFD/BMD decision is made ONCE here and the
+    # girder loop just calls the chosen profile builder.
+    is_sfd = "Vy" in comp_i
+    build_profile = _profile_sfd if is_sfd else _profile_bmd
+    unit = "kN" if is_sfd else "kN-m"
 
     # --- A. GLOBAL SCALING CALCULATIONS ---
     # We must scan ALL girders to find the global Max/Min forces.
     # This ensures that "Red" means the same force magnitude on Girder 1 as Girder 5.
-    all_forces = []
-    for g_data in GIRDERS.values():
-        for eid in g_data["elements"]:
-            v_i = float(ds.forces.sel(Element=eid, Component=comp_i))
-            v_j = float(ds.forces.sel(Element=eid, Component=comp_j))
-            all_forces.extend([v_i, v_j])
+    # One positional block read replaces ~90 individual label lookups.
+    # The same matrix is reused row-by-row in the plotting loop below -
+    # one pass over the force data covers both scaling and geometry.
+    mat = force_block(ALL_GIRDER_EIDS, [comp_i, comp_j])
 
     # 1. Height Scaling:
     # Forces are typically much larger than bridge dimensions (e.g., 200kN vs 25m).
     # We scale forces to be approx 5 meters high visually.
-    abs_forces = [abs(f) for f in all_forces]
-    max_abs_val = max(abs_forces) if abs_forces else 1.0
+    max_abs_val = float(np.abs(mat).max()) if mat.size else 1.0
     TARGET_HEIGHT = 5.0
     HEIGHT_SCALE = TARGET_HEIGHT / max_abs_val
 
     # 2. Color Limits (for Heat Map):
-    C_MIN, C_MAX = min(all_forces), max(all_forces)
+    C_MIN, C_MAX = float(mat.min()), float(mat.max())
 
     # 3. Z-Expansion Factor:
     # Artificially widens the bridge (1.5x) so inner girders aren't hidden by outer ones.
@@ -72,7 +157,17 @@ def create_midas_polished_plot(comp_i, comp_j, title):
     print(f"Generating {title}...")
     print(f" - Max Force: {max_abs_val:.2f} | Scale Factor: {HEIGHT_SCALE:.4f}")
 
+    # Profile outlines and hatching share the colorscale and its limits,
+    # so geometry from every girder is accumulated here and emitted as ONE
+    # trace after the loop - per-trace WebGL setup is expensive, and a
+    # single trace also means a single colorbar owner. The NaN separators
+    # already present in each array keep the sub-paths disconnected.
+    all_line_x, all_line_y, all_line_z, all_line_c = [], [], [], []
+
     # --- B. PLOTTING LOOP ---
+    # mat rows follow ALL_GIRDER_EIDS, i.e. the girders' element lists
+    # concatenated in iteration order; 'offset' tracks each girder's block.
+    offset = 0
     for g_name, data in GIRDERS.items():
 
         # 1. Plot Zero-Force Baseline (The Beam Axis)
@@ -92,86 +187,61 @@ def create_midas_polished_plot(comp_i, comp_j, title):
         ))
 
         # 2. Generate Diagram Geometry (Profile + Hatching)
-        outline_x, outline_y, outline_z, outline_c = [], [], [], []
-        hatch_x, hatch_y, hatch_z, hatch_c = [], [], [], []
-
-        for eid in data["elements"]:
-            sn, en = members[eid]
-            x1, _, z1 = nodes[sn]
-            x2, _, z2 = nodes[en]
-
-            # Apply Z-Expansion
-            z1 *= Z_EXPANSION
-            z2 *= Z_EXPANSION
-
-            val1 = float(ds.forces.sel(Element=eid, Component=comp_i))
-            val2 = float(ds.forces.sel(Element=eid, Component=comp_j))
-
-            # --- DIAGRAM LOGIC ---
-            if diagram_type == "SFD":
-                # Stepped Diagram: Constant Height & Color
-                h1 = val1 * HEIGHT_SCALE
-                h2 = val1 * HEIGHT_SCALE
-                c1, c2 = val1, val1
-            else:
-                # Linear Diagram: Sloped Height & Gradient Color
-                h1 = val1 * HEIGHT_SCALE
-                h2 = val2 * HEIGHT_SCALE
-                c1, c2 = val1, val2
-
-            # Append Top Profile Data
-            # 'None' breaks the line between elements for the discrete look
-            outline_x.extend([x1, x2, None])
-            outline_y.extend([h1, h2, None])
-            outline_z.extend([z1, z2, None])
-            outline_c.extend([c1, c2, c2])
-
-            # Append Vertical Hatching Data (The "Fence")
-            num_lines = 10
-            for k in range(num_lines + 1):
-                frac = k / num_lines
-
-                # Interpolate geometry
-                cx = x1 + (x2 - x1) * frac
-                cz = z1 + (z2 - z1) * frac
-                ch = h1 + (h2 - h1) * frac
-
-                # Interpolate color (creates gradient for BMD)
-                cc = c1 + (c2 - c1) * frac
-
-                # Draw vertical line from 0 to h
-                hatch_x.extend([cx, cx, None])
-                hatch_y.extend([0, ch, None])
-                hatch_z.extend([cz, cz, None])
-                hatch_c.extend([cc, cc, cc])
-
-        # Trace 3: The Top Profile (Thick Line)
-        fig.add_trace(go.Scatter3d(
-            x=outline_x, y=outline_y, z=outline_z,
-            mode='lines',
-            line=dict(width=6, color=outline_c, colorscale='Jet', cmin=C_MIN, cmax=C_MAX, showscale=False),
-            showlegend=False
-        ))
-
-        # Trace 4: The Hatching (Semi-Transparent Fill)
-        fig.add_trace(go.Scatter3d(
-            x=hatch_x, y=hatch_y, z=hatch_z,
-            mode='lines',
-            line=dict(
-                width=3,
-                color=hatch_c,
-                colorscale='Jet',
-                cmin=C_MIN, cmax=C_MAX,
-                # Show colorbar only once (for Girder 1)
-                showscale=True if g_name == "Girder 1" else False,
-                colorbar=dict(
-                    title=f"<b>Internal Force<br>({'kN' if 'Vy' in comp_i else 'kN-m'})</b>",
-                    x=0.9, len=0.6, thickness=15
-                )
-            ),
-            opacity=0.75,
-            showlegend=False
-        ))
+        # Gather the girder's geometry and forces as per-element arrays
+        rows = [IDX_OF[eid] for eid in data["elements"]]
+        x1, x2 = START_X[rows], END_X[rows]
+
+        # Apply Z-Expansion
+        z1 = START_Z[rows] * Z_EXPANSION
+        z2 = END_Z[rows] * Z_EXPANSION
+
+        vals = mat[offset:offset + len(rows)]
+        offset += len(rows)
+
+        # --- DIAGRAM LOGIC ---
+        # Heights and colours via the profile builder selected above
+        h1, h2, c1, c2 = build_profile(vals, HEIGHT_SCALE)
+
+        # Top Profile Data, preallocated with NaN breaks between elements
+        # for the discrete look
+        outline_x = _interleave(x1, x2)
+        outline_y = _interleave(h1, h2)
+        outline_z = _interleave(z1, z2)
+        outline_c = _interleave(c1, c2, gap=c2)
+
+        # Vertical Hatching Data (The "Fence"), built in compiled code
+        num_lines = 10
+        hatch_x, hatch_y, hatch_z, hatch_c = build_fence(
+            x1, x2, z1, z2, h1, h2, c1, c2, num_lines)
+
+        all_line_x += [outline_x, hatch_x]
+        all_line_y += [outline_y, hatch_y]
+        all_line_z += [outline_z, hatch_z]
+        all_line_c += [outline_c, hatch_c]
+
+    # Trace: Profile + Hatching (Semi-Transparent Fill)
+    # One trace for all five girders' outlines and fences combined. The
+    # outline loses its extra thickness relative to the hatch, but the
+    # topology is identical and the render cost drops with the trace count.
+    fig.add_trace(go.Scatter3d(
+        x=np.concatenate(all_line_x),
+        y=np.concatenate(all_line_y),
+        z=np.concatenate(all_line_z),
+        mode='lines',
+        line=dict(
+            width=4,
+            color=np.concatenate(all_line_c),
+            colorscale='Jet',
+            cmin=C_MIN, cmax=C_MAX,
+            showscale=True,
+            colorbar=dict(
+                title=f"<b>Internal Force<br>({unit})</b>",
+                x=0.9, len=0.6, thickness=15
+            )
+        ),
+        opacity=0.75,
+        showlegend=False
+    ))
 
     # --- C. LAYOUT & CAMERA ---
     fig.update_layout(